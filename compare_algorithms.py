@@ -49,15 +49,15 @@ def run_benchmark(circuit_file: str):
     
     class Linear4Qubit(LinearTopology):
         def __init__(self):
-            self.physical_qubits = ['P0', 'P1', 'P2', 'P3']
+            self.physical_qubits = [0, 1, 2, 3]
             self.coupling_graph = {
-                'P0': {'P1'},
-                'P1': {'P0', 'P2'},
-                'P2': {'P1', 'P3'},
-                'P3': {'P2'}
+                0: {1},
+                1: {0, 2},
+                2: {1, 3},
+                3: {2}
             }
+            self._build_lookup_tables()
         def __str__(self): return "Linear (4-qubit)"
-        def get_fidelity(self, q1, q2): return 1.0
 
     topologies = [
         ("Linear (4-qubit)", Linear4Qubit()),
@@ -15,26 +15,100 @@ class LinearTopology:
     """
     
     def __init__(self):
-        # Physical qubit labels
-        self.physical_qubits = ['P0', 'P1', 'P2']
+        # Physical qubit ids (P0, P1, P2)
+        self.physical_qubits: List[int] = [0, 1, 2]
         
         # Adjacency list representation of coupling graph
         # P0 connects to P1, P1 connects to P0 and P2, P2 connects to P1
-        self.coupling_graph: Dict[str, Set[str]] = {
-            'P0': {'P1'},
-            'P1': {'P0', 'P2'},
-            'P2': {'P1'}
+        self.coupling_graph: Dict[int, Set[int]] = {
+            0: {1},
+            1: {0, 2},
+            2: {1}
         }
+        
+        self._build_lookup_tables()
+    
+    def _build_lookup_tables(self):
+        """
+        Build the dense tables queried by the router.
+        Must be called at the end of __init__, once the coupling graph is set.
+        """
+        # BFS results are memoized per (start, end) until the tables are rebuilt
+        self._path_cache: Dict[Tuple[int, int], Tuple[int, ...]] = {}
+        self._distance_cache: Dict[Tuple[int, int], int] = {}
+        self._build_neighbor_lists()
+        self._build_adjacency_masks()
+        self._build_distance_matrix()
+        self._build_fidelity_matrix()
+    
+    def _build_neighbor_lists(self):
+        """
+        neighbors_int[i] is the tuple of physical qubits linked to Pi, in ascending
+        id order so that neighbor visits (and tie-breaking) are deterministic.
+        """
+        size = max(self.physical_qubits) + 1 if self.physical_qubits else 0
+        self.neighbors_int: List[Tuple[int, ...]] = [
+            tuple(sorted(self.coupling_graph.get(qubit, ()))) for qubit in range(size)
+        ]
+    
+    def _build_adjacency_masks(self):
+        """
+        Bitset adjacency: bit j of adj_mask[i] is set when Pi — Pj are linked.
+        """
+        size = max(self.physical_qubits) + 1 if self.physical_qubits else 0
+        self.adj_mask: List[int] = [0] * size
+        for qubit, neighbors in self.coupling_graph.items():
+            for neighbor in neighbors:
+                self.adj_mask[qubit] |= 1 << neighbor
+    
+    def _build_distance_matrix(self):
+        """
+        Precompute all-pairs shortest-path distances with one BFS per qubit.
+        dist[i][j] is indexed by the integer id of the physical qubits,
+        and is -1 when Pj is not reachable from Pi (same as shortest_distance).
+        """
+        size = max(self.physical_qubits) + 1 if self.physical_qubits else 0
+        self.dist: List[List[int]] = [[-1] * size for _ in range(size)]
+        
+        for start in self.physical_qubits:
+            row = self.dist[start]
+            row[start] = 0
+            visited = {start}
+            queue = deque([(start, 0)])
+            
+            while queue:
+                current, depth = queue.popleft()
+                for neighbor in self.coupling_graph.get(current, set()):
+                    if neighbor not in visited:
+                        visited.add(neighbor)
+                        row[neighbor] = depth + 1
+                        queue.append((neighbor, depth + 1))
+    
+    def _build_fidelity_matrix(self):
+        """
+        Dense fidelity table: fidelity[i][j] is the fidelity of the link Pi — Pj.
+        Ideal topologies have perfect (1.0) links.
+        """
+        size = max(self.physical_qubits) + 1 if self.physical_qubits else 0
+        self.fidelity: List[List[float]] = [[1.0] * size for _ in range(size)]
     
-    def are_adjacent(self, qubit1: str, qubit2: str) -> bool:
-        if qubit1 not in self.coupling_graph:
+    def are_adjacent(self, qubit1: int, qubit2: int) -> bool:
+        if not 0 <= qubit1 < len(self.adj_mask) or qubit2 < 0:
             return False
-        return qubit2 in self.coupling_graph[qubit1]
+        return (self.adj_mask[qubit1] >> qubit2) & 1 == 1
     
-    def shortest_path(self, start: str, end: str) -> List[str]:
+    def shortest_path(self, start: int, end: int) -> List[int]:
         """
         Find the shortest path between two physical qubits using BFS.
+        Results are cached per (start, end) pair.
         """
+        key = (start, end)
+        path = self._path_cache.get(key)
+        if path is None:
+            path = self._path_cache[key] = tuple(self._bfs_path(start, end))
+        return list(path)
+    
+    def _bfs_path(self, start: int, end: int) -> List[int]:
         if start == end:
             return [start]
         
@@ -54,11 +128,48 @@ class LinearTopology:
         
         return []
     
+    def shortest_distance(self, start: int, end: int) -> int:
+        """
+        Number of links on the shortest path between two physical qubits.
+        BFS that only tracks depths, without building the path.
+        Returns -1 if end is not reachable from start, the same value
+        stored in the dist matrix. Results are cached.
+        """
+        key = (start, end)
+        distance = self._distance_cache.get(key)
+        if distance is None:
+            distance = self._distance_cache[key] = self._bfs_distance(start, end)
+        return distance
+    
+    def _bfs_distance(self, start: int, end: int) -> int:
+        if start == end:
+            return 0
+        
+        depth = {start: 0}
+        queue = deque([start])
+        
+        while queue:
+            current = queue.popleft()
+            
+            for neighbor in self.coupling_graph.get(current, set()):
+                if neighbor not in depth:
+                    if neighbor == end:
+                        return depth[current] + 1
+                    depth[neighbor] = depth[current] + 1
+                    queue.append(neighbor)
+        
+        return -1
+    
     
-    def get_neighbors(self, qubit: str) -> Set[str]:
+    def get_neighbors(self, qubit: int) -> Set[int]:
         return self.coupling_graph.get(qubit, set())
+    
+    def get_neighbors_int(self, qubit: int) -> Tuple[int, ...]:
+        if not 0 <= qubit < len(self.neighbors_int):
+            return ()
+        return self.neighbors_int[qubit]
 
-    def get_fidelity(self, qubit1: str, qubit2: str) -> float:
+    def get_fidelity(self, qubit1: int, qubit2: int) -> float:
         """
         Get fidelity of the link between two qubits.
         Default is 1.0 (perfect) for ideal topology.
@@ -68,9 +179,12 @@ class LinearTopology:
             qubit2: Second physical qubit
             
         Returns:
-            Fidelity value between 0.0 and 1.0
+            Fidelity value between 0.0 and 1.0 (0.0 for unknown qubits)
         """
-        return 1.0
+        size = len(self.fidelity)
+        if not (0 <= qubit1 < size and 0 <= qubit2 < size):
+            return 0.0
+        return self.fidelity[qubit1][qubit2]
     
     def __str__(self) -> str:
         return "Linear Topology: P0 — P1 — P2"
@@ -84,19 +198,21 @@ class Grid2x2Topology(LinearTopology):
     P2 — P3
     """
     def __init__(self):
-        self.physical_qubits = ['P0', 'P1', 'P2', 'P3']
+        self.physical_qubits: List[int] = [0, 1, 2, 3]
         
         # Adjacency list representation of coupling graph
         # P0 connects to P1 and P2
         # P1 connects to P0 and P3
         # P2 connects to P0 and P3
         # P3 connects to P1 and P2
-        self.coupling_graph: Dict[str, Set[str]] = {
-            'P0': {'P1', 'P2'},
-            'P1': {'P0', 'P3'},
-            'P2': {'P0', 'P3'},
-            'P3': {'P1', 'P2'}
+        self.coupling_graph: Dict[int, Set[int]] = {
+            0: {1, 2},
+            1: {0, 3},
+            2: {0, 3},
+            3: {1, 2}
         }
+        
+        self._build_lookup_tables()
     
     def __str__(self) -> str:
         return "Grid Topology: 2x2 (4 physical qubits)"
@@ -121,7 +237,7 @@ class HeavyHexTopology(LinearTopology):
     """
     
     def __init__(self):
-        self.physical_qubits = [f'P{i}' for i in range(14)]
+        self.physical_qubits: List[int] = list(range(14))
         
         connections = [
             (0, 1), (1, 2),
@@ -134,27 +250,24 @@ class HeavyHexTopology(LinearTopology):
             (12, 13)
         ]
         
-        self.coupling_graph: Dict[str, Set[str]] = {}
+        self.coupling_graph: Dict[int, Set[int]] = {}
         for i in range(14):
-            self.coupling_graph[f'P{i}'] = set()
+            self.coupling_graph[i] = set()
             
         for u, v in connections:
-            p_u, p_v = f'P{u}', f'P{v}'
-            self.coupling_graph[p_u].add(p_v)
-            self.coupling_graph[p_v].add(p_u)
+            self.coupling_graph[u].add(v)
+            self.coupling_graph[v].add(u)
+            
+        self._build_lookup_tables()
             
         # In a real scenario, this would come from IBM Quantum API
-        self.fidelities = {
-            (u, v): 0.99 for u in self.coupling_graph for v in self.coupling_graph[u]
-        }
+        # Pairs without a link have fidelity 0.0
+        self.fidelity = [[0.0] * 14 for _ in range(14)]
+        for u, v in connections:
+            self.fidelity[u][v] = self.fidelity[v][u] = 0.99
         # Add some "bad" links to test fidelity-aware routing
-        self.fidelities[('P4', 'P5')] = 0.92
-        self.fidelities[('P5', 'P4')] = 0.92
-        self.fidelities[('P9', 'P11')] = 0.95
-        self.fidelities[('P11', 'P9')] = 0.95
-
-    def get_fidelity(self, q1: str, q2: str) -> float:
-        return self.fidelities.get((q1, q2), 0.0)
+        self.fidelity[4][5] = self.fidelity[5][4] = 0.92
+        self.fidelity[9][11] = self.fidelity[11][9] = 0.95
 
     def __str__(self) -> str:
         return "Heavy-Hex Topology: 14-qubit simplified patch"
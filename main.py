@@ -11,18 +11,25 @@ Orchestrates the complete flow:
 
 from lark import Lark, Tree, Token
 from qmap_dialect import (
-    LogicalQubit, QMapIR, SingleQubitGateOp, TryTwoQubitOp
+    LogicalQubit, QMapIR, SingleQubitGateOp, TryTwoQubitOp, InsertSwapOp
 )
 from hardware_configs import DEFAULT_TOPOLOGY
 from optimizer import run_optimizer
+from functools import lru_cache
 import sys
 
 
+@lru_cache(maxsize=None)
+def load_grammar(grammar_file: str) -> str:
+    with open(grammar_file, 'r') as f:
+        return f.read()
+
+
 class CircuitParser:
     def __init__(self, grammar_file: str = "grammar.lark"):
-        with open(grammar_file, 'r') as f:
-            grammar = f.read()
-        self.parser = Lark(grammar, start='start')
+        grammar = load_grammar(grammar_file)
+        # LALR is linear-time; cache=True stores the compiled tables on disk
+        self.parser = Lark(grammar, start='start', parser='lalr', cache=True)
     
     def parse(self, circuit_text: str) -> QMapIR:
         tree = self.parser.parse(circuit_text)
@@ -30,12 +37,8 @@ class CircuitParser:
     
     def _build_ir(self, tree: Tree) -> QMapIR:
         ir = QMapIR()
-        
-        for instruction in tree.children:
-            op = self._process_instruction(instruction)
-            if op:
-                ir.add_operation(op)
-        
+        ops = (self._process_instruction(instruction) for instruction in tree.children)
+        ir.add_operations(op for op in ops if op)
         return ir
     
     def _process_instruction(self, instruction: Tree):
@@ -107,7 +110,8 @@ def main():
     print_separator("Summary")
     original_ops = len(unoptimized_ir.operations)
     optimized_ops = len(optimized_ir.operations)
-    swaps_inserted = sum(1 for op in optimized_ir.operations if 'insert_swap' in op.to_mlir())
+    swap_ops = [op for op in optimized_ir.operations if isinstance(op, InsertSwapOp)]
+    swaps_inserted = len(swap_ops)
     
     print(f"Original operations:     {original_ops}")
     print(f"Optimized operations:    {optimized_ops}")
@@ -120,13 +124,8 @@ def main():
         print("📋 SWAP Operations Detail:")
         print("-" * 70)
         
-        swap_count = 0
-        for op in optimized_ir.operations:
-            if 'insert_swap' in op.to_mlir():
-                swap_count += 1
-                from qmap_dialect import InsertSwapOp
-                if isinstance(op, InsertSwapOp):
-                    print(f"  SWAP #{swap_count}: {op.qubit1} ↔ {op.qubit2}")
+        for swap_count, op in enumerate(swap_ops, start=1):
+            print(f"  SWAP #{swap_count}: {op.qubit1} ↔ {op.qubit2}")
         
         print("-" * 70)
     
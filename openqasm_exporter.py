@@ -6,47 +6,70 @@ from qmap_dialect import (
     QMapIR, Operation, SingleQubitGateOp, TryTwoQubitOp, 
     InsertSwapOp, CurrentLayoutOp, LogicalQubit, PhysicalQubit
 )
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set
 
 class OpenQASMExporter:
+    # Line templates for the emitted gates
+    _SWAP_FMT = "swap p[%d], p[%d];"
+    _1Q_FMT = "%s p[%d];"
+    _2Q_FMT = "%s p[%d], p[%d];"
+    
+    # Lowercased gate names that differ in OpenQASM
+    _GATE_NAMES: Dict[str, str] = {'cnot': 'cx'}
+    
     def __init__(self, num_physical_qubits: int = 20):
         self.num_physical_qubits = num_physical_qubits
         self.qasm_lines: List[str] = []
         self.logical_to_physical: Dict[int, int] = {}
+        self._gate_name_cache: Dict[str, str] = {}
         
     def export(self, ir: QMapIR) -> str:
         """
         Convert IR to OpenQASM 3.0 string.
         """
+        # Each export starts from a clean mapping, so one exporter can be reused
+        self.logical_to_physical = {}
         self.qasm_lines = [
             "OPENQASM 3.0;",
             "include \"stdgates.inc\";",
             f"qubit[{self.num_physical_qubits}] p;"
         ]
         
-        for op in ir.operations:
-            self._process_operation(op)
+        process = self._process_operation
+        self.qasm_lines.extend(
+            line for line in map(process, ir.operations) if line is not None
+        )
             
         return "\n".join(self.qasm_lines)
     
-    def _process_operation(self, op: Operation):
+    def _gate_name(self, gate: str) -> str:
+        name = self._gate_name_cache.get(gate)
+        if name is None:
+            name = gate.lower()
+            name = self._GATE_NAMES.get(name, name)
+            self._gate_name_cache[gate] = name
+        return name
+    
+    def _process_operation(self, op: Operation) -> Optional[str]:
+        """
+        Return the OpenQASM line for an operation, or None if it emits nothing.
+        """
         if isinstance(op, CurrentLayoutOp):
             # Update internal mapping
-            for lq, pq in op.layout.items():
-                self.logical_to_physical[lq.id] = pq.id
+            for lid, pid in enumerate(op.physical_ids()):
+                if pid != -1:
+                    self.logical_to_physical[lid] = pid
+            return None
                 
         elif isinstance(op, InsertSwapOp):
             # Physical SWAP
-            p1 = op.qubit1.id
-            p2 = op.qubit2.id
-            self.qasm_lines.append(f"swap p[{p1}], p[{p2}];")
+            return self._SWAP_FMT % (op.qubit1.id, op.qubit2.id)
             
         elif isinstance(op, SingleQubitGateOp):
             # Logical gate mapped to physical
             lid = op.qubit.id
             pid = self.logical_to_physical.get(lid, lid) # Default to identity if missing
-            gate = op.gate.lower()
-            self.qasm_lines.append(f"{gate} p[{pid}];")
+            return self._1Q_FMT % (self._gate_name(op.gate), pid)
             
         elif isinstance(op, TryTwoQubitOp):
             # Logical two-qubit gate mapped to physical
@@ -56,8 +79,6 @@ class OpenQASMExporter:
             c_pid = self.logical_to_physical.get(c_lid, c_lid)
             t_pid = self.logical_to_physical.get(t_lid, t_lid)
             
-            gate = op.gate.lower()
-            if gate == 'cnot':
-                gate = 'cx'
-                
-            self.qasm_lines.append(f"{gate} p[{c_pid}], p[{t_pid}];")
+            return self._2Q_FMT % (self._gate_name(op.gate), c_pid, t_pid)
+        
+        return None
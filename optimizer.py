@@ -1,10 +1,54 @@
-from typing import Dict, List, Optional
+from collections import deque
+from functools import lru_cache
+from typing import Deque, Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
 from qmap_dialect import (
     LogicalQubit, PhysicalQubit, Operation, QMapIR,
     TryTwoQubitOp, InsertSwapOp, CurrentLayoutOp, SingleQubitGateOp
 )
 from hardware_configs import LinearTopology
 
+# SWAP greedy concessi per porta, in multipli della sua distanza iniziale
+RELEASE_VALVE_FACTOR = 2
+
+# Extended Layer (look-ahead SABRE): numero di porte e peso W nel costo
+EXTENDED_SET_SIZE = 20
+EXTENDED_SET_WEIGHT = 0.5
+
+
+def _score_kernel(dist: List[List[int]], front_phys: List[Tuple[int, int]],
+                  candidate_swaps: Sequence[Tuple[int, int]]) -> List[int]:
+    """
+    Calcola H = Σ dist(P(c), P(t)) sul Front Layer per tutti gli SWAP candidati
+    in un solo passaggio. Uno SWAP (p1, p2) cambia solo le porte che toccano
+    p1 o p2, quindi ogni punteggio è H corrente più la variazione di quelle porte.
+    """
+    base = 0
+    gates_on: Dict[int, List[int]] = {}
+    for index, (pc, pt) in enumerate(front_phys):
+        base += dist[pc][pt]
+        gates_on.setdefault(pc, []).append(index)
+        gates_on.setdefault(pt, []).append(index)
+    
+    no_gates: List[int] = []
+    scores = [base] * len(candidate_swaps)
+    for i, (p1, p2) in enumerate(candidate_swaps):
+        on_p1 = gates_on.get(p1, no_gates)
+        for index in on_p1:
+            scores[i] += _swap_delta(dist, front_phys[index], p1, p2)
+        for index in gates_on.get(p2, no_gates):
+            # Una porta su p1 e p2 è già stata contata
+            if index not in on_p1:
+                scores[i] += _swap_delta(dist, front_phys[index], p1, p2)
+    return scores
+
+
+def _swap_delta(dist: List[List[int]], gate_phys: Tuple[int, int], p1: int, p2: int) -> int:
+    """Variazione di dist(P(c), P(t)) per una porta quando si scambiano p1 e p2."""
+    pc, pt = gate_phys
+    new_pc = p2 if pc == p1 else p1 if pc == p2 else pc
+    new_pt = p2 if pt == p1 else p1 if pt == p2 else pt
+    return dist[new_pc][new_pt] - dist[pc][pt]
+
 
 class QMapOptimizerPass:
     """
@@ -12,114 +56,175 @@ class QMapOptimizerPass:
     qubit fisici sono adiacenti. Se non lo sono, inserisce operazioni SWAP
     per avvicinare i qubit.
     """
-    def __init__(self, topology: LinearTopology):
+    def __init__(self, topology: LinearTopology, initial_layout_search: int = 0):
         self.topology = topology
-        self.current_layout: Dict[LogicalQubit, PhysicalQubit] = {}
+        # Numero di iterazioni avanti/indietro per scegliere il layout iniziale (0 = identità)
+        self.initial_layout_search = initial_layout_search
+        # Layout come due tabelle di interi: logico -> fisico e fisico -> logico (-1 = libero)
+        self.log2phys: List[int] = []
+        self.phys2log: List[int] = []
+        # Front Layer mantenuto in modo incrementale (indici nella lista delle operazioni)
+        self._operations: List[Operation] = []
+        self._front: Deque[int] = deque()
+        self._front_qubits: Set[LogicalQubit] = set()
+        self._scan_index = 0
+        # Gli SWAP candidati dipendono solo dai qubit fisici del Front Layer
+        self._candidate_swaps_for = lru_cache(maxsize=256)(self._compute_candidate_swaps)
     
-    def initialize_layout(self, num_qubits: int) -> CurrentLayoutOp:
+    def initialize_layout(self, num_qubits: int, layout: Optional[List[int]] = None) -> CurrentLayoutOp:
+        """
+        Inizializza il layout: identità, oppure layout[l] = qubit fisico del qubit logico l.
+        """
+        num_physical = len(self.topology.physical_qubits)
+        if num_qubits > num_physical:
+            raise ValueError(
+                f"Circuit needs {num_qubits} qubits but the topology only has {num_physical}"
+            )
         
-        self.current_layout = {
-            LogicalQubit(i): PhysicalQubit(i) 
-            for i in range(num_qubits)
-        }
-        return CurrentLayoutOp(self.current_layout)
+        self.log2phys = list(layout) if layout is not None else list(range(num_qubits))
+        self.phys2log = [-1] * num_physical
+        for lq, pq in enumerate(self.log2phys):
+            self.phys2log[pq] = lq
+        return self._current_layout_op()
     
-    def get_physical_qubits(self, lq1: LogicalQubit, lq2: LogicalQubit) -> tuple[PhysicalQubit, PhysicalQubit]:
-        pq1 = self.current_layout[lq1]
-        pq2 = self.current_layout[lq2]
-        return pq1, pq2
+    def _current_layout_op(self) -> CurrentLayoutOp:
+        """Materializza il layout corrente come operazione dell'IR."""
+        return CurrentLayoutOp.from_ids(self.log2phys)
     
-    def _apply_swap(self, pq1: PhysicalQubit, pq2: PhysicalQubit):
+    def get_physical_qubits(self, lq1: LogicalQubit, lq2: LogicalQubit) -> tuple[int, int]:
+        return self.log2phys[lq1.id], self.log2phys[lq2.id]
+    
+    def _apply_swap(self, p1: int, p2: int):
         """
         Applica un'operazione SWAP al layout corrente.
-        Scambia quali qubit logici sono memorizzati su pq1 e pq2.
+        Scambia quali qubit logici sono memorizzati su p1 e p2.
         """
-        lq1 = None
-        lq2 = None
-        
-        for lq, pq in self.current_layout.items():
-            if pq == pq1:
-                lq1 = lq
-            elif pq == pq2:
-                lq2 = lq
+        l1 = self.phys2log[p1]
+        l2 = self.phys2log[p2]
         
         # Scambia le mappature
-        if lq1 is not None:
-            self.current_layout[lq1] = pq2
-        if lq2 is not None:
-            self.current_layout[lq2] = pq1
+        if l1 != -1:
+            self.log2phys[l1] = p2
+        if l2 != -1:
+            self.log2phys[l2] = p1
+        self.phys2log[p1] = l2
+        self.phys2log[p2] = l1
     
     # Metodi SABRE Look-Ahead
-    def _build_front_layer(self, remaining_ops: List[Operation]) -> List[TryTwoQubitOp]:
+    def _init_front_layer(self, operations: List[Operation]):
         """
-        Costruisce il Front Layer: insieme delle prossime porte a due qubit
-        che possono essere eseguite.
+        Prepara il Front Layer incrementale per una nuova lista di operazioni.
         """
-        front_layer = []
-        used_qubits = set()
-        
-        for op in remaining_ops:
+        self._operations = operations
+        self._front = deque()
+        self._front_qubits = set()
+        self._scan_index = 0
+        self._extend_front_layer()
+    
+    def _extend_front_layer(self):
+        """
+        Estende il Front Layer con le prossime porte a due qubit finché
+        non si incontra una porta che usa un qubit già presente nel layer.
+        """
+        operations = self._operations
+        while self._scan_index < len(operations):
+            op = operations[self._scan_index]
             if isinstance(op, TryTwoQubitOp):
                 # Controlla se i qubit sono già usati in questo layer
-                if op.control not in used_qubits and op.target not in used_qubits:
-                    front_layer.append(op)
-                    used_qubits.add(op.control)
-                    used_qubits.add(op.target)
-                else:
+                if op.control in self._front_qubits or op.target in self._front_qubits:
                     break
-        
-        return front_layer
+                self._front.append(self._scan_index)
+                self._front_qubits.add(op.control)
+                self._front_qubits.add(op.target)
+            self._scan_index += 1
     
-    def _calculate_score(self, potential_layout: Dict[LogicalQubit, PhysicalQubit], front_layer: List[TryTwoQubitOp]) -> float:
+    def _commit_gate(self, index: int):
         """
-        Calcola il costo H(layout) = Σ dist(P(q1), P(q2)) per tutte le porte nel Front Layer.
+        Rimuove dal Front Layer la porta emessa (sempre la prima del layer)
+        e libera i suoi qubit per le porte successive.
         """
-        total_distance = 0
+        if self._front and self._front[0] == index:
+            op = self._operations[self._front.popleft()]
+            self._front_qubits.discard(op.control)
+            self._front_qubits.discard(op.target)
+            self._extend_front_layer()
+    
+    def _build_front_layer(self) -> List[TryTwoQubitOp]:
+        """
+        Restituisce il Front Layer: insieme delle prossime porte a due qubit
+        che possono essere eseguite.
+        """
+        return [self._operations[index] for index in self._front]
+    
+    def _build_extended_layer(self) -> List[TryTwoQubitOp]:
+        """
+        Restituisce l'Extended Layer: le prossime EXTENDED_SET_SIZE porte a due
+        qubit dopo il Front Layer, a partire dal punto in cui si è fermata la scansione.
+        """
+        extended_layer = []
+        operations = self._operations
+        index = self._scan_index
+        while index < len(operations) and len(extended_layer) < EXTENDED_SET_SIZE:
+            op = operations[index]
+            if isinstance(op, TryTwoQubitOp):
+                extended_layer.append(op)
+            index += 1
+        return extended_layer
+    
+    def _calculate_score(self, front_layer: List[TryTwoQubitOp],
+                         candidate_swaps: Sequence[Tuple[int, int]],
+                         extended_layer: Optional[List[TryTwoQubitOp]] = None) -> List[float]:
+        """
+        Calcola il costo H(layout) = Σ dist(P(q1), P(q2)) per tutte le porte nel Front Layer,
+        per ciascuno SWAP candidato applicato al layout corrente.
+        Con un Extended Layer E: H = H_front + W * H_ext / |E|.
+        """
+        scores = _score_kernel(self.topology.dist, self._physical_pairs(front_layer), candidate_swaps)
         
-        for gate in front_layer:
-            # Ottieni i qubit fisici nel layout ipotetico
-            pq1 = potential_layout.get(gate.control)
-            pq2 = potential_layout.get(gate.target)
-            
-            if pq1 is None or pq2 is None:
-                continue
-            
-            # Calcola la distanza sulla topologia
-            path = self.topology.shortest_path(str(pq1), str(pq2))
-            distance = len(path) - 1 if path else 0
-            total_distance += distance
+        if extended_layer:
+            ext_scores = _score_kernel(self.topology.dist, self._physical_pairs(extended_layer), candidate_swaps)
+            weight = EXTENDED_SET_WEIGHT / len(extended_layer)
+            scores = [score + weight * ext for score, ext in zip(scores, ext_scores)]
         
-        return total_distance
+        return scores
+    
+    def _physical_pairs(self, gates: List[TryTwoQubitOp]) -> List[Tuple[int, int]]:
+        return [(self.log2phys[gate.control.id], self.log2phys[gate.target.id]) for gate in gates]
     
-    def _get_candidate_swaps(self, front_layer: List[TryTwoQubitOp]) -> List[tuple]:
+    def _get_candidate_swaps(self, front_layer: List[TryTwoQubitOp]) -> Tuple[Tuple[int, int], ...]:
         """
         Identifica gli SWAP candidati: SWAP tra qubit fisici adiacenti
         che coinvolgono almeno un qubit logico presente nel Front Layer.
         """
-        # Estrai qubit logici coinvolti nel front layer
-        logical_qubits_in_front = set()
-        for gate in front_layer:
-            logical_qubits_in_front.add(gate.control)
-            logical_qubits_in_front.add(gate.target)
-        
-        # Trova i loro qubit fisici
-        physical_qubits_in_front = set()
-        for lq in logical_qubits_in_front:
-            if lq in self.current_layout:
-                physical_qubits_in_front.add(self.current_layout[lq])
+        # Qubit fisici su cui si trovano i qubit logici del front layer
+        physical_qubits_in_front = frozenset(
+            self.log2phys[lq.id]
+            for gate in front_layer
+            for lq in (gate.control, gate.target)
+        )
+        return self._candidate_swaps_for(physical_qubits_in_front)
+    
+    def _compute_candidate_swaps(self, physical_qubits_in_front: FrozenSet[int]) -> Tuple[Tuple[int, int], ...]:
+        """
+        Genera gli SWAP candidati: ogni qubit fisico con i suoi vicini.
+        Memoizzato in __init__ tramite lru_cache.
+        """
+        # Ogni coppia non ordinata è codificata come (min << shift) | max
+        shift = len(self.topology.neighbors_int).bit_length()
+        mask = (1 << shift) - 1
         
-        # Genera SWAP candidati: ogni qubit fisico con i suoi vicini
         candidate_swaps = set()
         for pq in physical_qubits_in_front:
-            neighbors = self.topology.get_neighbors(str(pq))
-            for neighbor_str in neighbors:
-                neighbor_pq = PhysicalQubit(int(neighbor_str[1]))
-                swap_tuple = tuple(sorted([pq.id, neighbor_pq.id]))
-                candidate_swaps.add(swap_tuple)
+            for neighbor in self.topology.get_neighbors_int(pq):
+                if pq < neighbor:
+                    candidate_swaps.add((pq << shift) | neighbor)
+                else:
+                    candidate_swaps.add((neighbor << shift) | pq)
         
-        return [(PhysicalQubit(a), PhysicalQubit(b)) for a, b in candidate_swaps]
+        return tuple((key >> shift, key & mask) for key in sorted(candidate_swaps))
     
-    def _select_best_swap(self, front_layer: List[TryTwoQubitOp], debug: bool = False) -> Optional[InsertSwapOp]:
+    def _select_best_swap(self, front_layer: List[TryTwoQubitOp], debug: bool = False,
+                          extended_layer: Optional[List[TryTwoQubitOp]] = None) -> Optional[InsertSwapOp]:
         """
         Seleziona il miglior SWAP usando la funzione di costo H del look-ahead
         e la fedeltà (fedeltà) dei link fisici.
@@ -132,116 +237,169 @@ class QMapOptimizerPass:
         if not candidate_swaps:
             return None
         
-        best_swap = None
+        best_candidate = None
         best_score = float('inf')
         
         if debug:
             print(f"\n  🔍 Look-Ahead: Evaluating {len(candidate_swaps)} candidate SWAPs...")
             print(f"  Front Layer: {[f'{g.gate}({g.control},{g.target})' for g in front_layer]}")
         
-        for pq1, pq2 in candidate_swaps:
-            #layout temporaneo
-            potential_layout = self.current_layout.copy()
-            
-            lq1 = None
-            lq2 = None
-            for lq, pq in potential_layout.items():
-                if pq == pq1:
-                    lq1 = lq
-                elif pq == pq2:
-                    lq2 = lq
-            
-            # SWAP
-            if lq1 is not None:
-                potential_layout[lq1] = pq2
-            if lq2 is not None:
-                potential_layout[lq2] = pq1 
-            
-            # costo H
-            dist_score = self._calculate_score(potential_layout, front_layer)
-            
+        # costo H di tutti i candidati, senza modificare il layout
+        dist_scores = self._calculate_score(front_layer, candidate_swaps, extended_layer)
+        
+        for (p1, p2), dist_score in zip(candidate_swaps, dist_scores):
             # Fedeltà
-            fidelity = self.topology.get_fidelity(str(pq1), str(pq2))
+            fidelity = self.topology.get_fidelity(p1, p2)
             fidelity_cost = 1.0 - fidelity
             
             # Moltiplicatore 10 significa che il 10% di perdita di fedeltà è circa equivalente a 1 unità di distanza
             combined_score = dist_score + (fidelity_cost * 10.0)
             
             if debug:
-                print(f"    SWAP {pq1}↔{pq2}: Dist = {dist_score}, Fidelity = {fidelity:.2f}, Score = {combined_score:.2f}")
+                print(f"    SWAP P{p1}↔P{p2}: Dist = {dist_score:.2f}, Fidelity = {fidelity:.2f}, Score = {combined_score:.2f}")
             
             if combined_score < best_score:
                 best_score = combined_score
-                best_swap = InsertSwapOp(pq1, pq2, cost=fidelity_cost)
+                best_candidate = (p1, p2, fidelity_cost)
+        
+        if best_candidate is None:
+            return None
         
-        if debug and best_swap:
+        p1, p2, fidelity_cost = best_candidate
+        best_swap = InsertSwapOp(PhysicalQubit(p1), PhysicalQubit(p2), cost=fidelity_cost)
+        
+        if debug:
             print(f"  ✅ Selected: SWAP {best_swap.qubit1}↔{best_swap.qubit2} (Score = {best_score:.2f})")
         
         return best_swap
     
-    def optimize(self, ir: QMapIR, debug: bool = True) -> QMapIR:
+    def _swap_towards(self, pq1: int, pq2: int, debug: bool = False) -> Optional[InsertSwapOp]:
+        """
+        Valvola di sicurezza: SWAP che avvicina pq1 a pq2 di un passo lungo
+        il cammino minimo. Garantisce la terminazione quando la scelta
+        greedy del look-ahead continua a oscillare tra gli stessi SWAP.
+        """
+        dist = self.topology.dist
+        for neighbor in self.topology.get_neighbors_int(pq1):
+            if dist[neighbor][pq2] == dist[pq1][pq2] - 1:
+                p1, p2 = min(pq1, neighbor), max(pq1, neighbor)
+                if debug:
+                    print(f"  ⛑️  Release valve: SWAP P{p1}↔P{p2} along the shortest path")
+                return InsertSwapOp(PhysicalQubit(p1), PhysicalQubit(p2),
+                                    cost=1.0 - self.topology.get_fidelity(p1, p2))
+        return None
+    
+    def _route_gate(self, op: TryTwoQubitOp, pq1: int, pq2: int, debug: bool = False) -> List[InsertSwapOp]:
+        """
+        Inserisce SWAP finché i qubit fisici pq1 e pq2 della porta op non sono adiacenti.
+        Applica gli SWAP al layout corrente e li restituisce.
+        """
+        front_layer = self._build_front_layer()
+        extended_layer = self._build_extended_layer()
+        
+        swaps = []
+        # Oltre questo numero di SWAP il look-ahead sta oscillando
+        swap_budget = RELEASE_VALVE_FACTOR * self.topology.dist[pq1][pq2]
+        while True:
+            if len(swaps) < swap_budget:
+                best_swap = self._select_best_swap(front_layer, debug=debug,
+                                                   extended_layer=extended_layer)
+                if best_swap is None:
+                    print(f"⚠️  Warning: No SWAP candidates found for {op}")
+                    break
+            else:
+                best_swap = self._swap_towards(pq1, pq2, debug=debug)
+                if best_swap is None:
+                    print(f"⚠️  Warning: P{pq1} and P{pq2} are not connected, no shortest-path step for {op}")
+                    break
+            
+            swaps.append(best_swap)
+            self._apply_swap(best_swap.qubit1.id, best_swap.qubit2.id)
+            
+            pq1, pq2 = self.get_physical_qubits(op.control, op.target)
+            if self.topology.are_adjacent(pq1, pq2):
+                break
+        
+        return swaps
+    
+    def _search_initial_layout(self, ir: QMapIR, iterations: int) -> Tuple[List[int], QMapIR, List[int]]:
+        """
+        Ricerca del layout iniziale in stile SABRE: instrada il circuito in avanti,
+        poi il circuito invertito partendo dal layout finale, e ripete.
+        Il layout finale del passo all'indietro è il nuovo layout iniziale.
+        Restituisce il layout che ha richiesto meno SWAP in avanti, insieme al
+        circuito già instradato da quel layout e al relativo layout finale.
+        """
+        reversed_ir = QMapIR(list(reversed(ir.operations)))
+        layout = list(range(_count_logical_qubits(ir)))
+        best = None
+        best_swaps = None
+        
+        for iteration in range(iterations + 1):
+            forward_ir = self.optimize(ir, debug=False, initial_layout=layout)
+            swaps = sum(1 for op in forward_ir.operations if isinstance(op, InsertSwapOp))
+            if best_swaps is None or swaps < best_swaps:
+                best, best_swaps = (layout, forward_ir, list(self.log2phys)), swaps
+            
+            if iteration == iterations:
+                break
+            self.optimize(reversed_ir, debug=False, initial_layout=self.log2phys)
+            layout = list(self.log2phys)
+        
+        return best
+    
+    def optimize_with_initial_search(self, ir: QMapIR, iterations: int = 3, debug: bool = True) -> QMapIR:
+        """
+        Instrada il circuito partendo dal layout trovato da _search_initial_layout.
+        Il risultato della ricerca viene riusato: si reinstrada solo per la traccia di debug.
+        """
+        layout, best_ir, final_layout = self._search_initial_layout(ir, iterations)
+        if debug:
+            return self.optimize(ir, debug=True, initial_layout=layout)
+        
+        # Lo stato del pass riflette la passata migliore, come dopo optimize()
+        self.initialize_layout(len(final_layout), final_layout)
+        return best_ir
+    
+    def optimize(self, ir: QMapIR, debug: bool = True, initial_layout: Optional[List[int]] = None) -> QMapIR:
 
-        optimized_ops = []
+        if initial_layout is None and self.initial_layout_search > 0:
+            return self.optimize_with_initial_search(ir, self.initial_layout_search, debug=debug)
         
-        logical_qubits = set()
-        for op in ir.operations:
-            if isinstance(op, TryTwoQubitOp):
-                logical_qubits.add(op.control)
-                logical_qubits.add(op.target)
-            elif isinstance(op, SingleQubitGateOp):
-                logical_qubits.add(op.qubit)
+        optimized_ops = []
         
-        num_qubits = max([lq.id for lq in logical_qubits]) + 1 if logical_qubits else 0
+        num_qubits = _count_logical_qubits(ir)
         
-        initial_layout = self.initialize_layout(num_qubits)
-        optimized_ops.append(initial_layout)
+        optimized_ops.append(self.initialize_layout(num_qubits, initial_layout))
         
         if debug:
             print("\n🤖 SABRE Look-Ahead Optimizer Active")
             print("=" * 70)
         
-        # Converte le operazioni in una lista che possiamo iterare e tracciare
-        remaining_ops = list(ir.operations)
-        op_index = 0
+        # Scorre le operazioni sul posto, senza copie né slicing della lista
+        operations = ir.operations
+        self._init_front_layer(operations)
         
-        while op_index < len(remaining_ops):
-            op = remaining_ops[op_index]
-            
+        for op_index, op in enumerate(operations):
             if isinstance(op, SingleQubitGateOp):
                 optimized_ops.append(op)
-                op_index += 1
             
             elif isinstance(op, TryTwoQubitOp):
                 pq1, pq2 = self.get_physical_qubits(op.control, op.target)
                 
-                front_layer = self._build_front_layer(remaining_ops[op_index:])
-                
-                num_swaps_for_gate = 0
-                while not self.topology.are_adjacent(str(pq1), str(pq2)):
-                    best_swap = self._select_best_swap(front_layer, debug=debug)
-                    
-                    if best_swap is None:
-                        print(f"⚠️  Warning: No SWAP candidates found for {op}")
-                        break
-                    
-                    optimized_ops.append(best_swap)
-                    
-                    self._apply_swap(best_swap.qubit1, best_swap.qubit2)
-                    num_swaps_for_gate += 1
-                    pq1, pq2 = self.get_physical_qubits(op.control, op.target)
-                    
-                    front_layer = self._build_front_layer(remaining_ops[op_index:])
-                
-                if num_swaps_for_gate > 0:
-                    # Aggiorna il layout dopo gli SWAP
-                    optimized_ops.append(CurrentLayoutOp(self.current_layout))
+                # Percorso veloce: porta già eseguibile, nessun look-ahead
+                if not self.topology.are_adjacent(pq1, pq2):
+                    swaps = self._route_gate(op, pq1, pq2, debug)
+                    if swaps:
+                        optimized_ops.extend(swaps)
+                        # Aggiorna il layout dopo gli SWAP
+                        optimized_ops.append(self._current_layout_op())
                 
                 optimized_ops.append(op)
-                op_index += 1
+                self._commit_gate(op_index)
             
             else:
                 optimized_ops.append(op)
-                op_index += 1
         
         if debug:
             print("=" * 70)
@@ -250,6 +408,18 @@ class QMapOptimizerPass:
         return QMapIR(optimized_ops)
 
 
+def _count_logical_qubits(ir: QMapIR) -> int:
+    logical_qubits = set()
+    for op in ir.operations:
+        if isinstance(op, TryTwoQubitOp):
+            logical_qubits.add(op.control)
+            logical_qubits.add(op.target)
+        elif isinstance(op, SingleQubitGateOp):
+            logical_qubits.add(op.qubit)
+    
+    return max([lq.id for lq in logical_qubits]) + 1 if logical_qubits else 0
+
+
 def run_optimizer(ir: QMapIR, topology: LinearTopology) -> QMapIR:
     optimizer = QMapOptimizerPass(topology)
     return optimizer.optimize(ir)
@@ -5,12 +5,10 @@ h p[0];
 h p[1];
 h p[2];
 h p[3];
-swap p[0], p[4];
-cx p[4], p[3];
+swap p[3], p[4];
+cx p[0], p[4];
 cx p[1], p[2];
-swap p[0], p[1];
-swap p[1], p[2];
-swap p[0], p[1];
-swap p[0], p[4];
-cx p[4], p[3];
+swap p[2], p[6];
+swap p[5], p[6];
+cx p[5], p[4];
 cx p[0], p[1];
\ No newline at end of file
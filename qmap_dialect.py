@@ -1,61 +1,100 @@
-from typing import Dict, List, Optional
-from dataclasses import dataclass
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
 
-@dataclass
 class LogicalQubit:
-    id: int
+    """
+    Flyweight: LogicalQubit(i) always returns the same instance for a given id,
+    so equality is identity and the hash is the id itself.
+    The string forms are built once, when the instance is created.
+    """
+    __slots__ = ('id', '_str', '_repr')
+    _cache: Dict[int, "LogicalQubit"] = {}
+    
+    def __new__(cls, id: int) -> "LogicalQubit":
+        inst = cls._cache.get(id)
+        if inst is None:
+            inst = object.__new__(cls)
+            inst.id = id
+            inst._str = f"q{id}"
+            inst._repr = f"LogicalQubit(q{id})"
+            cls._cache[id] = inst
+        return inst
+    
+    def __reduce__(self):
+        return (LogicalQubit, (self.id,))
     
     def __str__(self) -> str:
-        return f"q{self.id}"
+        return self._str
     
     def __repr__(self) -> str:
-        return f"LogicalQubit(q{self.id})"
+        return self._repr
     
     def __hash__(self) -> int:
-        return hash(self.id)
+        return self.id
     
     def __eq__(self, other) -> bool:
-        if isinstance(other, LogicalQubit):
-            return self.id == other.id
-        return False
+        return self is other
 
 
-@dataclass
 class PhysicalQubit:
-    id: int
+    """
+    Flyweight: PhysicalQubit(i) always returns the same instance for a given id,
+    so equality is identity and the hash is the id itself.
+    The string forms are built once, when the instance is created.
+    """
+    __slots__ = ('id', '_str', '_repr')
+    _cache: Dict[int, "PhysicalQubit"] = {}
+    
+    def __new__(cls, id: int) -> "PhysicalQubit":
+        inst = cls._cache.get(id)
+        if inst is None:
+            inst = object.__new__(cls)
+            inst.id = id
+            inst._str = f"P{id}"
+            inst._repr = f"PhysicalQubit(P{id})"
+            cls._cache[id] = inst
+        return inst
+    
+    def __reduce__(self):
+        return (PhysicalQubit, (self.id,))
     
     def __str__(self) -> str:
-        return f"P{self.id}"
+        return self._str
     
     def __repr__(self) -> str:
-        return f"PhysicalQubit(P{self.id})"
+        return self._repr
     
     def __hash__(self) -> int:
-        return hash(self.id)
+        return self.id
     
     def __eq__(self, other) -> bool:
-        if isinstance(other, PhysicalQubit):
-            return self.id == other.id
-        return False
+        return self is other
 
 
 
 # QMap Operations
 
-class Operation:
+class Operation(ABC):
+    # Pre-rendered MLIR text, or None while the op still has to be rendered
+    __slots__ = ('_mlir_cache',)
     
+    @abstractmethod
     def to_mlir(self) -> str:
         """Convert operation to MLIR-like string representation"""
-        raise NotImplementedError
 
 
 class SingleQubitGateOp(Operation):
+    __slots__ = ('gate', 'qubit')
+    
     def __init__(self, gate: str, qubit: LogicalQubit):
         self.gate = gate
         self.qubit = qubit
+        # Operations are not modified after construction: render once
+        self._mlir_cache = f"{gate} q{qubit.id}"
     
     def to_mlir(self) -> str:
-        return f"{self.gate} {self.qubit}"
+        return self._mlir_cache
     
     def __str__(self) -> str:
         return self.to_mlir()
@@ -66,63 +105,129 @@ class TryTwoQubitOp(Operation):
     The optimizer will check if the corresponding physical qubits
     are adjacent and insert SWAPs if needed.
     """
+    __slots__ = ('gate', 'control', 'target')
+    
     def __init__(self, gate: str, control: LogicalQubit, target: LogicalQubit):
         self.gate = gate
         self.control = control
         self.target = target
+        self._mlir_cache = f"qmap.try_two_qubit @{gate}(%q{control.id}, %q{target.id})"
     
     def to_mlir(self) -> str:
-        return f"qmap.try_two_qubit @{self.gate}(%{self.control}, %{self.target})"
+        return self._mlir_cache
     
     def __str__(self) -> str:
         return self.to_mlir()
 
 
 class InsertSwapOp(Operation):
+    __slots__ = ('qubit1', 'qubit2', 'cost')
+    
     def __init__(self, qubit1: PhysicalQubit, qubit2: PhysicalQubit, cost: float = 0.0):
         self.qubit1 = qubit1
         self.qubit2 = qubit2
         self.cost = cost
+        # Only the common zero-cost form is pre-rendered
+        self._mlir_cache = None if cost > 0 else f"qmap.insert_swap %P{qubit1.id}, %P{qubit2.id}"
     
     def to_mlir(self) -> str:
-        if self.cost > 0:
-            return f"qmap.insert_swap %{self.qubit1}, %{self.qubit2} {{cost={self.cost:.2f}}}"
-        return f"qmap.insert_swap %{self.qubit1}, %{self.qubit2}"
+        if self._mlir_cache is not None:
+            return self._mlir_cache
+        return f"qmap.insert_swap %{self.qubit1}, %{self.qubit2} {{cost={self.cost:.2f}}}"
     
     def __str__(self) -> str:
         return self.to_mlir()
 
 
 class CurrentLayoutOp(Operation):
+    """
+    Immutable layout snapshot stored as two dense id tuples:
+    _l2p[logical id] = physical id and _p2l[physical id] = logical id (-1 = unmapped).
+    Snapshots never change after construction, so they can share their tables freely.
+    """
     def __init__(self, layout: Dict[LogicalQubit, PhysicalQubit]):
-        self.layout = layout.copy()
+        # Rendered on the first to_mlir() call
+        self._mlir_cache = None
+        num_logical = max((lq.id for lq in layout), default=-1) + 1
+        num_physical = max((pq.id for pq in layout.values()), default=-1) + 1
+        l2p = [-1] * num_logical
+        p2l = [-1] * num_physical
+        for lq, pq in layout.items():
+            l2p[lq.id] = pq.id
+            p2l[pq.id] = lq.id
+        self._l2p: Tuple[int, ...] = tuple(l2p)
+        self._p2l: Tuple[int, ...] = tuple(p2l)
+    
+    @classmethod
+    def _from_tables(cls, l2p: Tuple[int, ...], p2l: Tuple[int, ...]) -> "CurrentLayoutOp":
+        op = cls.__new__(cls)
+        op._mlir_cache = None
+        op._l2p = l2p
+        op._p2l = p2l
+        return op
+    
+    @classmethod
+    def from_ids(cls, logical_to_physical: Sequence[int]) -> "CurrentLayoutOp":
+        """Build a snapshot from a logical id -> physical id table."""
+        l2p = tuple(logical_to_physical)
+        p2l = [-1] * (max(l2p, default=-1) + 1)
+        for lq, pq in enumerate(l2p):
+            if pq != -1:
+                p2l[pq] = lq
+        return cls._from_tables(l2p, tuple(p2l))
+    
+    @property
+    def layout(self) -> Dict[LogicalQubit, PhysicalQubit]:
+        return {LogicalQubit(lq): PhysicalQubit(pq) for lq, pq in enumerate(self._l2p) if pq != -1}
+    
+    def physical_ids(self) -> Tuple[int, ...]:
+        """Physical id of each logical id, -1 where the logical qubit is unmapped"""
+        return self._l2p
     
     def to_mlir(self) -> str:
-        mappings = ", ".join([f"{lq}->{pq}" for lq, pq in sorted(self.layout.items(), key=lambda x: x[0].id)])
-        return f"qmap.current_layout {{{mappings}}}"
+        if self._mlir_cache is None:
+            # _l2p is already in logical id order: no sort, no qubit objects
+            self._mlir_cache = "qmap.current_layout {" + ", ".join(
+                f"q{lq}->P{pq}" for lq, pq in enumerate(self._l2p) if pq != -1
+            ) + "}"
+        return self._mlir_cache
     
     def __str__(self) -> str:
         return self.to_mlir()
     
     def get_physical_qubit(self, logical: LogicalQubit) -> Optional[PhysicalQubit]:
         """Get the physical qubit mapped to a logical qubit"""
-        return self.layout.get(logical)
+        if 0 <= logical.id < len(self._l2p) and self._l2p[logical.id] != -1:
+            return PhysicalQubit(self._l2p[logical.id])
+        return None
     
     def get_logical_qubit(self, physical: PhysicalQubit) -> Optional[LogicalQubit]:
         """Get the logical qubit mapped to a physical qubit"""
-        for lq, pq in self.layout.items():
-            if pq == physical:
-                return lq
+        if 0 <= physical.id < len(self._p2l) and self._p2l[physical.id] != -1:
+            return LogicalQubit(self._p2l[physical.id])
         return None
     
-    def swap_physical_qubits(self, p1: PhysicalQubit, p2: PhysicalQubit):
-        lq1 = self.get_logical_qubit(p1)
-        lq2 = self.get_logical_qubit(p2)
+    def with_swap(self, p1: int, p2: int) -> "CurrentLayoutOp":
+        """New snapshot with physical ids p1 and p2 exchanged; only those entries are patched."""
+        p2l = list(self._p2l)
+        if max(p1, p2) >= len(p2l):
+            p2l.extend([-1] * (max(p1, p2) + 1 - len(p2l)))
         
-        if lq1 is not None:
-            self.layout[lq1] = p2
-        if lq2 is not None:
-            self.layout[lq2] = p1
+        lq1, lq2 = p2l[p1], p2l[p2]
+        p2l[p1], p2l[p2] = lq2, lq1
+        if lq1 == -1 and lq2 == -1:
+            return self._from_tables(self._l2p, tuple(p2l))
+        
+        l2p = list(self._l2p)
+        if lq1 != -1:
+            l2p[lq1] = p2
+        if lq2 != -1:
+            l2p[lq2] = p1
+        return self._from_tables(tuple(l2p), tuple(p2l))
+    
+    def swap_physical_qubits(self, p1: PhysicalQubit, p2: PhysicalQubit) -> "CurrentLayoutOp":
+        """Return a new snapshot with p1 and p2 swapped; this one is left unchanged."""
+        return self.with_swap(p1.id, p2.id)
 
 
 # IR Container
@@ -134,6 +239,10 @@ class QMapIR:
     def add_operation(self, op: Operation):
         self.operations.append(op)
     
+    def add_operations(self, ops: Iterable[Operation]):
+        """Append a block of operations with a single list extend."""
+        self.operations.extend(ops)
+    
     def to_mlir(self) -> str:
         return "\n".join([op.to_mlir() for op in self.operations])
     
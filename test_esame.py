@@ -1,13 +1,13 @@
 
 import sys
 import os
+from functools import lru_cache
+from typing import List
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from qmap_dialect import QMapIR, LogicalQubit, SingleQubitGateOp, TryTwoQubitOp
+from qmap_dialect import QMapIR, Operation, LogicalQubit, SingleQubitGateOp, TryTwoQubitOp, InsertSwapOp
 from hardware_configs import DEFAULT_TOPOLOGY
-from optimizer import run_optimizer
-from openqasm_exporter import OpenQASMExporter
 
 def print_separator(title=""):
     print("\n" + "=" * 60)
@@ -15,11 +15,9 @@ def print_separator(title=""):
         print(f" {title}")
     print("=" * 60)
 
-def int_to_bin_qubits(value, num_bits):
-    return format(value, f'0{num_bits}b')
-
 def generate_adder_circuit(a: int, b: int) -> QMapIR:
     ir = QMapIR()
+    ops: List[Operation] = []
     
     # We use 4 qubits: q0,q1 for A; q2,q3 for B
     # Result will be in q2,q3
@@ -27,31 +25,32 @@ def generate_adder_circuit(a: int, b: int) -> QMapIR:
     # Classical Input -> Quantum State
     # 1 = Apply X gate. 0 = Identity.
     
-    # Convert inputs to 2 bits (modulo 4)
-    a_bits = int_to_bin_qubits(a % 4, 2)
-    b_bits = int_to_bin_qubits(b % 4, 2)
+    # Keep inputs on 2 bits (modulo 4)
+    a_bits = a & 3
+    b_bits = b & 3
     
-    print(f"Converting inputs: {a}->{a_bits}, {b}->{b_bits}")
+    print(f"Converting inputs: {a}->{a_bits:02b}, {b}->{b_bits:02b}")
         
-    # Input A on q0, q1
-    if a_bits[0] == '1': ir.add_operation(SingleQubitGateOp("X", LogicalQubit(0)))
-    if a_bits[1] == '1': ir.add_operation(SingleQubitGateOp("X", LogicalQubit(1)))
+    # Input A on q0, q1 (high bit on q0)
+    if a_bits & 2: ops.append(SingleQubitGateOp("X", LogicalQubit(0)))
+    if a_bits & 1: ops.append(SingleQubitGateOp("X", LogicalQubit(1)))
     
     # Input B on q2, q3
-    if b_bits[0] == '1': ir.add_operation(SingleQubitGateOp("X", LogicalQubit(2)))
-    if b_bits[1] == '1': ir.add_operation(SingleQubitGateOp("X", LogicalQubit(3)))
+    if b_bits & 2: ops.append(SingleQubitGateOp("X", LogicalQubit(2)))
+    if b_bits & 1: ops.append(SingleQubitGateOp("X", LogicalQubit(3)))
     
     # We Compute B += A
     
     # Sum the high bits: q0 -> q2
-    ir.add_operation(TryTwoQubitOp("CNOT", LogicalQubit(0), LogicalQubit(2)))
+    ops.append(TryTwoQubitOp("CNOT", LogicalQubit(0), LogicalQubit(2)))
     
     # Sum the low bits: q1 -> q3
-    ir.add_operation(TryTwoQubitOp("CNOT", LogicalQubit(1), LogicalQubit(3)))
+    ops.append(TryTwoQubitOp("CNOT", LogicalQubit(1), LogicalQubit(3)))
     
-    ir.add_operation(SingleQubitGateOp("H", LogicalQubit(0)))
-    ir.add_operation(TryTwoQubitOp("CNOT", LogicalQubit(0), LogicalQubit(3)))
+    ops.append(SingleQubitGateOp("H", LogicalQubit(0)))
+    ops.append(TryTwoQubitOp("CNOT", LogicalQubit(0), LogicalQubit(3)))
     
+    ir.add_operations(ops)
     return ir
 
 def show_menu():
@@ -60,68 +59,90 @@ def show_menu():
     print("2. Display Hardware Topology")
     print("3. Exit")
 
+@lru_cache(maxsize=None)
+def get_exporter():
+    # Built once, on the first compilation; importing it here keeps the other options light
+    from openqasm_exporter import OpenQASMExporter
+    return OpenQASMExporter(len(DEFAULT_TOPOLOGY.physical_qubits))
+
+def handle_sum() -> bool:
+    print("\n>> Quantum Sum Generator")
+    # Only the compilation path needs the router
+    from optimizer import run_optimizer
+    
+    try:
+        in_a = input("Enter integer A: ")
+        in_b = input("Enter integer B: ")
+        
+        val_a = int(in_a)
+        val_b = int(in_b)
+        
+        #Generate Circuit (IR)
+        print_separator("1. Generating Circuit")
+        ir = generate_adder_circuit(val_a, val_b)
+        print("Generated IR (Logical):")
+        print(ir.to_mlir())
+        
+        # Optimization
+        print_separator("2. Optimizing (Routing)")
+        print(f"Routing on topology: {DEFAULT_TOPOLOGY}")
+        
+        optimized_ir = run_optimizer(ir, DEFAULT_TOPOLOGY)
+    
+        # Result
+        print_separator("3. Compilation Result")
+        print("Compilaton Successful!")
+        
+        # Statistics
+        ops_count = len(optimized_ir.operations)
+        swaps = sum(1 for op in optimized_ir.operations if isinstance(op, InsertSwapOp))
+        print(f"Total Operations: {ops_count}")
+        print(f"SWAPs Inserted: {swaps}")
+        
+        # Show OpenQASM
+        print("\nGenerated OpenQASM 3.0:")
+        print(get_exporter().export(optimized_ir))
+        res = (val_a + val_b) % 4 # Simple XOR approximation logic valid for <4 without carry out
+        xor_res = val_a ^ val_b
+        print(f"\n Expected XOR result: {xor_res} (Binary: {format(xor_res, '02b')})")
+        
+    except ValueError:
+        print("Error: Please enter valid integers.")
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
+    return True
+
+def handle_topology() -> bool:
+    print_separator("Hardware Topology")
+    print(DEFAULT_TOPOLOGY)
+    print(f"Physical Qubits: {[f'P{q}' for q in DEFAULT_TOPOLOGY.physical_qubits]}")
+    graph = {f'P{q}': {f'P{n}' for n in neighbors} for q, neighbors in DEFAULT_TOPOLOGY.coupling_graph.items()}
+    print(f"Connectivity Graph: {graph}")
+    return True
+
+def handle_exit() -> bool:
+    print("\nExiting...")
+    return False
+
+def handle_unknown() -> bool:
+    print("Invalid option. Please try again.")
+    return True
+
+# Menu option -> handler; a handler returns False to leave the loop
+HANDLERS = {
+    '1': handle_sum,
+    '2': handle_topology,
+    '3': handle_exit,
+}
+
 def main():
     print_separator("QMap Exam Test")
 
     while True:
         show_menu()
         choice = input("Select an option: ").strip()
-        
-        if choice == '1':
-            print("\n>> Quantum Sum Generator")
-            try:
-                in_a = input("Enter integer A: ")
-                in_b = input("Enter integer B: ")
-                
-                val_a = int(in_a)
-                val_b = int(in_b)
-                
-                #Generate Circuit (IR)
-                print_separator("1. Generating Circuit")
-                ir = generate_adder_circuit(val_a, val_b)
-                print("Generated IR (Logical):")
-                print(ir.to_mlir())
-                
-                # Optimization
-                print_separator("2. Optimizing (Routing)")
-                print(f"Routing on topology: {DEFAULT_TOPOLOGY}")
-                
-                optimized_ir = run_optimizer(ir, DEFAULT_TOPOLOGY)
-            
-                # Result
-                print_separator("3. Compilation Result")
-                print("Compilaton Successful!")
-                
-                # Statistics
-                ops_count = len(optimized_ir.operations)
-                swaps = sum(1 for op in optimized_ir.operations if 'insert_swap' in op.to_mlir())
-                print(f"Total Operations: {ops_count}")
-                print(f"SWAPs Inserted: {swaps}")
-                
-                # Show OpenQASM
-                print("\nGenerated OpenQASM 3.0:")
-                exporter = OpenQASMExporter(len(DEFAULT_TOPOLOGY.physical_qubits))
-                print(exporter.export(optimized_ir))
-                res = (val_a + val_b) % 4 # Simple XOR approximation logic valid for <4 without carry out
-                xor_res = val_a ^ val_b
-                print(f"\n Expected XOR result: {xor_res} (Binary: {format(xor_res, '02b')})")
-                
-            except ValueError:
-                print("Error: Please enter valid integers.")
-            except Exception as e:
-                print(f"An unexpected error occurred: {e}")
-                
-        elif choice == '2':
-            print_separator("Hardware Topology")
-            print(DEFAULT_TOPOLOGY)
-            print(f"Physical Qubits: {DEFAULT_TOPOLOGY.physical_qubits}")
-            print(f"Connectivity Graph: {DEFAULT_TOPOLOGY.coupling_graph}")
-            
-        elif choice == '3':
-            print("\nExiting...")
+        if not HANDLERS.get(choice, handle_unknown)():
             break
-        else:
-            print("Invalid option. Please try again.")
 
 if __name__ == "__main__":
     main()